@@ -10,7 +10,14 @@ from pygame.mouse     import get_pos
 from pygame.event     import get
 
 # Using random module for randomizing the mines' locations
-from random import choice
+from random import choice, sample, seed
+
+# Using struct and mmap to write board archives and read single boards from them without loading the whole file
+from struct import Struct
+from mmap   import mmap, ACCESS_READ
+
+# Using argparse to choose between playing and generating a board archive from the command line
+from argparse import ArgumentParser, ArgumentTypeError
 
 # Using pickle to save and load data from encrypted files
 from pickle import load, dump
@@ -18,6 +25,9 @@ from pickle import load, dump
 # Using pathlib to check if a file exists
 from pathlib import Path
 
+# Using os to move a finished board archive in place, so an interrupted generation never leaves a broken archive
+from os import replace
+
 
 class AnimatedImage:
     def __init__(self, x: int, y: int, frames: list):
@@ -65,18 +75,21 @@ def draw_grid(root: Surface, x_grids: int, y_grids: int):
 
 def generate_mines(amount_of_mines: int, x_grid_size: int, y_grid_size: int, avoid_locations: list):
     available_locations = [(x, y) for x in range(x_grid_size) for y in range(y_grid_size)]
-    hint_numbers        = [[0 for _ in range(x_grid_size)] for _ in range(y_grid_size)]
-    mines_locations     = []
 
     for location_to_avoid in avoid_locations:
         if 0 < location_to_avoid[0]+1 < x_grid_size+1 and 0 < location_to_avoid[1]+1 < y_grid_size+1:
             available_locations.remove(location_to_avoid)
 
-    for mine in range(amount_of_mines):
-        mine_location = choice(available_locations)
-        available_locations.pop(available_locations.index(mine_location))
-        mines_locations.append(mine_location)
+    # Picking all the mines at once instead of removing them one by one from the available locations
+    mines_locations = sample(available_locations, amount_of_mines)
+
+    return mines_locations, calculate_hint_numbers(mines_locations, x_grid_size, y_grid_size)
+
 
+def calculate_hint_numbers(mines_locations: list, x_grid_size: int, y_grid_size: int):
+    hint_numbers = [[0 for _ in range(x_grid_size)] for _ in range(y_grid_size)]
+
+    for mine_location in mines_locations:
         # If the number is negative, there is a bomb in the tile, so in order to keep the number negative,
         # it must be below -8 because 0 is an empty tile. THIS WORKS! It COULD be something much more convenient
         # but it works and that's all that matters
@@ -123,10 +136,362 @@ def generate_mines(amount_of_mines: int, x_grid_size: int, y_grid_size: int, avo
                 hint_numbers[mine_location[1]][mine_location[0]-1] \
                     = hint_numbers[mine_location[1]][mine_location[0]-1]+1
 
-    return mines_locations, hint_numbers
+    return hint_numbers
+
+
+def get_neighbours(tile: tuple, x_grid_size: int, y_grid_size: int):
+    tiles_to_check = [
+        (tile[0], tile[1]-1),     # Top
+        (tile[0]+1, tile[1]-1),   # Top right
+        (tile[0]+1, tile[1]),     # Right
+        (tile[0]+1, tile[1]+1),   # Bottom right
+        (tile[0], tile[1]+1),     # Bottom
+        (tile[0]-1, tile[1]+1),   # Bottom left
+        (tile[0]-1, tile[1]),     # Left
+        (tile[0]-1, tile[1]-1)    # Top left
+    ]
+
+    return [
+        neighbour for neighbour in tiles_to_check
+        if 0 <= neighbour[0] < x_grid_size and 0 <= neighbour[1] < y_grid_size
+    ]
+
+
+def flip_tiles(start_tile: tuple, flipped_tiles: list, flagged_tiles: list, mines_locations: list,
+               hint_numbers: list, x_grid_size: int, y_grid_size: int):
+    current_tile = (start_tile[0], start_tile[1])
+    path         = [current_tile]
+
+    flipped_tiles.append((current_tile[0], current_tile[1]))
+
+    # Using reverse backtracking to flip all the tiles connected to the clicked tile
+    while len(path) > 0:
+        available_neighbours = []
+
+        for tile in get_neighbours(current_tile, x_grid_size, y_grid_size):
+            if hint_numbers[current_tile[1]][current_tile[0]] == 0:
+                if tile not in flipped_tiles:
+                    if tile not in flagged_tiles:
+                        if tile not in mines_locations:
+                            available_neighbours.append(tile)
+
+        if len(available_neighbours) > 0:
+            path.append(current_tile)
+            current_tile = list(available_neighbours)[0]
+            flipped_tiles.append(current_tile)
+        else:
+            current_tile = path[-1]
+            path         = path[:-1]
+
+
+def get_all_neighbours(x_grid_size: int, y_grid_size: int):
+    return {
+        (x, y): get_neighbours((x, y), x_grid_size, y_grid_size)
+        for x in range(x_grid_size) for y in range(y_grid_size)
+    }
+
+
+def is_solvable_without_guessing(mines_locations: list, hint_numbers: list, start_tile: tuple,
+                                 x_grid_size: int, y_grid_size: int, neighbours: dict = None):
+    # Play the board from the start tile using only moves that are certainly safe. If every empty tile
+    # can be flipped this way, the player never has to guess
+    mines_locations = set(mines_locations)
+    flipped_tiles   = set()
+    flagged_tiles   = set()
+
+    # Numbers that still have unknown tiles around them, the rest of the flipped tiles cannot tell anything new
+    open_numbers    = set()
+
+    # Only numbers next to a tile that has just been flipped or flagged can tell something new
+    tiles_to_check  = set()
+
+    # Checking many boards of the same size is faster when the neighbours are given from outside
+    if neighbours is None:
+        neighbours = get_all_neighbours(x_grid_size, y_grid_size)
+
+    def flip(tile: tuple):
+        tiles_to_flip = [tile]
+        while len(tiles_to_flip) > 0:
+            tile = tiles_to_flip.pop()
+            if tile in flipped_tiles:
+                continue
+
+            flipped_tiles.add(tile)
+            tiles_to_check.update(neighbours[tile])
+            if hint_numbers[tile[1]][tile[0]] == 0:
+                tiles_to_flip.extend(neighbours[tile])
+            else:
+                open_numbers.add(tile)
+                tiles_to_check.add(tile)
+
+    def flag(tiles: set):
+        flagged_tiles.update(tiles)
+        for tile in tiles:
+            tiles_to_check.update(neighbours[tile])
+
+    flip(start_tile)
+
+    progress = True
+    while progress:
+        progress = False
+
+        while len(tiles_to_check) > 0:
+            tile = tiles_to_check.pop()
+            if tile not in open_numbers:
+                continue
+
+            unknown_tiles   = {n for n in neighbours[tile] if n not in flipped_tiles and n not in flagged_tiles}
+            remaining_mines = hint_numbers[tile[1]][tile[0]] - len([n for n in neighbours[tile] if n in flagged_tiles])
+
+            if len(unknown_tiles) == 0:
+                open_numbers.discard(tile)
+            elif remaining_mines == 0:
+                for unknown_tile in unknown_tiles:
+                    flip(unknown_tile)
+            elif remaining_mines == len(unknown_tiles):
+                flag(unknown_tiles)
+
+        constraints = []
+        for tile in open_numbers:
+            unknown_tiles   = {n for n in neighbours[tile] if n not in flipped_tiles and n not in flagged_tiles}
+            remaining_mines = hint_numbers[tile[1]][tile[0]] - len([n for n in neighbours[tile] if n in flagged_tiles])
+            constraints.append((frozenset(unknown_tiles), remaining_mines))
+
+        # If the unknown tiles around one number are a part of the unknown tiles around another number,
+        # the rest of the other number's tiles hold exactly the difference of the two numbers' mines.
+        # Such numbers always share an unknown tile, so they are looked up by tile instead of comparing every pair
+        constraints_by_tile = {}
+        for constraint in constraints:
+            for unknown_tile in constraint[0]:
+                constraints_by_tile.setdefault(unknown_tile, []).append(constraint)
+
+        for smaller_tiles, smaller_mines in constraints:
+            for larger_tiles, larger_mines in constraints_by_tile[next(iter(smaller_tiles))]:
+                if smaller_tiles < larger_tiles:
+                    difference_tiles = larger_tiles - smaller_tiles
+                    difference_mines = larger_mines - smaller_mines
+
+                    if difference_mines == 0:
+                        for difference_tile in difference_tiles:
+                            flip(difference_tile)
+                        progress = True
+                    elif difference_mines == len(difference_tiles):
+                        flag(difference_tiles)
+                        progress = True
+
+            if progress:
+                break
+
+    return len(flipped_tiles) == (x_grid_size * y_grid_size) - len(mines_locations) \
+        and not flipped_tiles & mines_locations
+
+
+# Board archive ---------------------------------------
+#
+# Header:   magic, version, amount of sections
+# Sections: width, height, amount of mines, no-guess flag, record size, offset of the first record, amount of boards
+# Records:  start tile (x, y) followed by a bitmap of the mines, one bit per tile in row order
+#
+# Every record in a section has the same size, so board N can be read straight from its offset
+
+ARCHIVE_MAGIC   = b"MSBA"
+ARCHIVE_VERSION = 1
+
+archive_header  = Struct("<4sHH")
+archive_section = Struct("<HHHBxIQQ")
+archive_record  = Struct("<HH")
+
+
+def max_amount_of_mines(x_grid_size: int, y_grid_size: int):
+    # The mines cannot be placed on the first clicked tile or next to it, and the amount of mines is stored
+    # in a 16-bit field of the board archive
+    return min(x_grid_size * y_grid_size - min(x_grid_size, 3) * min(y_grid_size, 3), 65535)
+
+
+def parse_board_size(board_size: str):
+    # Board sizes are given as WIDTHxHEIGHT:MINES, for example 15x15:20
+    try:
+        dimensions, amount_of_mines = board_size.split(":")
+        x_grid_size, y_grid_size    = dimensions.lower().split("x")
+        x_grid_size, y_grid_size, amount_of_mines = int(x_grid_size), int(y_grid_size), int(amount_of_mines)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid board size '{board_size}', expected WIDTHxHEIGHT:MINES")
+
+    # The sizes are stored in 16-bit fields of the board archive
+    if not 1 <= x_grid_size <= 65535 or not 1 <= y_grid_size <= 65535:
+        raise ArgumentTypeError(f"invalid board size '{board_size}', width and height must be between 1 and 65535")
+
+    if not 0 <= amount_of_mines <= max_amount_of_mines(x_grid_size, y_grid_size):
+        raise ArgumentTypeError(
+            f"invalid board size '{board_size}', a {x_grid_size}x{y_grid_size} board can have "
+            f"0 to {max_amount_of_mines(x_grid_size, y_grid_size)} mines"
+        )
+
+    return x_grid_size, y_grid_size, amount_of_mines
+
+
+def parse_amount(amount: str):
+    try:
+        amount = int(amount)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid amount '{amount}', expected a whole number")
+
+    if amount < 0:
+        raise ArgumentTypeError(f"invalid amount '{amount}', it cannot be negative")
+
+    return amount
+
+
+def generate_board_archive(path: str, board_sizes: list, amount_of_boards: int, no_guess: bool = False,
+                           max_tries: int = 10000, progress_interval: int = 0):
+    sections    = []
+    offset      = archive_header.size + archive_section.size * len(board_sizes)
+
+    # Everything is checked before the file is opened, so invalid arguments never leave a file behind
+    if amount_of_boards < 0:
+        raise ValueError(f"the amount of boards cannot be negative: {amount_of_boards}")
+
+    # Sections are looked up by their size, so a second section with the same size could never be reached
+    if len(set(board_sizes)) != len(board_sizes):
+        raise ValueError("every board size can be given only once")
 
+    for x_grid_size, y_grid_size, amount_of_mines in board_sizes:
+        if not 1 <= x_grid_size <= 65535 or not 1 <= y_grid_size <= 65535:
+            raise ValueError(f"invalid board size: {x_grid_size}x{y_grid_size}")
+
+        if not 0 <= amount_of_mines <= max_amount_of_mines(x_grid_size, y_grid_size):
+            raise ValueError(f"invalid amount of mines for a {x_grid_size}x{y_grid_size} board: {amount_of_mines}")
+
+        record_size = archive_record.size + (x_grid_size * y_grid_size + 7) // 8
+        sections.append((x_grid_size, y_grid_size, amount_of_mines, no_guess, record_size, offset, amount_of_boards))
+        offset += record_size * amount_of_boards
+
+    temporary_path = f"{path}.tmp"
+
+    try:
+        with open(temporary_path, "wb") as archive:
+            archive.write(archive_header.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(sections)))
+            for section in sections:
+                archive.write(archive_section.pack(*section))
+
+            # Boards are written one at a time, so the whole archive never has to fit in memory
+            boards_written = 0
+            for x_grid_size, y_grid_size, amount_of_mines, _, record_size, _, _ in sections:
+                neighbours = get_all_neighbours(x_grid_size, y_grid_size)
+
+                for _ in range(amount_of_boards):
+                    for _ in range(max_tries):
+                        start_tile = (choice(range(x_grid_size)), choice(range(y_grid_size)))
+                        mines_locations, hint_numbers = generate_mines(
+                            amount_of_mines, x_grid_size, y_grid_size,
+                            [start_tile] + neighbours[start_tile]
+                        )
+
+                        if not no_guess or is_solvable_without_guessing(
+                                mines_locations, hint_numbers, start_tile, x_grid_size, y_grid_size, neighbours
+                        ):
+                            break
+                    else:
+                        # Dense boards are almost never solvable without guessing, so give up instead of
+                        # trying forever
+                        raise ValueError(
+                            f"no board solvable without guessing found in {max_tries} tries for a "
+                            f"{x_grid_size}x{y_grid_size} board with {amount_of_mines} mines "
+                            f"({amount_of_mines / (x_grid_size * y_grid_size):.0%} of the tiles)"
+                        )
+
+                    mines_bitmap = bytearray(record_size - archive_record.size)
+                    for mine_location in mines_locations:
+                        bit = mine_location[1] * x_grid_size + mine_location[0]
+                        mines_bitmap[bit // 8] |= 1 << (bit % 8)
+
+                    archive.write(archive_record.pack(*start_tile))
+                    archive.write(mines_bitmap)
+
+                    boards_written += 1
+                    if progress_interval > 0 and boards_written % progress_interval == 0:
+                        print(f"{boards_written}/{amount_of_boards * len(sections)} boards written")
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
+
+    replace(temporary_path, path)   # -> os.replace()
+
+
+class BoardArchive:
+    def __init__(self, path: str):
+        # An empty file cannot be memory-mapped, so files shorter than the header are rejected before that
+        if Path(path).stat().st_size < archive_header.size:
+            raise ValueError(f"'{path}' is not a board archive")
+
+        with open(path, "rb") as archive:
+            self.data = mmap(archive.fileno(), 0, access=ACCESS_READ)  # -> mmap.mmap()
+
+        magic, version, amount_of_sections = archive_header.unpack_from(self.data, 0)
+        sections_end = archive_header.size + archive_section.size * amount_of_sections
+
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION or len(self.data) < sections_end:
+            self.data.close()
+            raise ValueError(f"'{path}' is not a board archive")
+
+        self.sections = [
+            archive_section.unpack_from(self.data, archive_header.size + archive_section.size * section)
+            for section in range(amount_of_sections)
+        ]
 
-def minesweeper():
+        # Every record must have the size its board needs and be in the file, otherwise the archive is damaged
+        # or has been cut short
+        for x_grid_size, y_grid_size, _, _, record_size, offset, amount_of_boards in self.sections:
+            if x_grid_size < 1 or y_grid_size < 1 \
+                    or record_size != archive_record.size + (x_grid_size * y_grid_size + 7) // 8 \
+                    or offset < sections_end or len(self.data) < offset + record_size * amount_of_boards:
+                self.data.close()
+                raise ValueError(f"'{path}' is not a board archive")
+
+    def find_section(self, x_grid_size: int, y_grid_size: int, amount_of_mines: int, no_guess: bool = None):
+        # If no_guess is given, only a section with the same no-guess flag is accepted
+        for section in range(len(self.sections)):
+            if self.sections[section][:3] == (x_grid_size, y_grid_size, amount_of_mines) \
+                    and (no_guess is None or self.is_no_guess(section) == no_guess):
+                return section
+
+        raise KeyError(
+            f"no {'no-guess ' if no_guess else ''}{x_grid_size}x{y_grid_size} boards with {amount_of_mines} mines "
+            f"in the archive"
+        )
+
+    def amount_of_boards(self, section: int):
+        return self.sections[section][6]
+
+    def is_no_guess(self, section: int):
+        return bool(self.sections[section][3])
+
+    def load_board(self, section: int, board: int):
+        x_grid_size, y_grid_size, _, _, record_size, offset, amount_of_boards = self.sections[section]
+        if not 0 <= board < amount_of_boards:
+            raise IndexError(f"board {board} is out of range, the section has {amount_of_boards} boards")
+
+        # Only the requested record is read from the file
+        record_offset   = offset + record_size * board
+        start_tile      = archive_record.unpack_from(self.data, record_offset)
+        if not (0 <= start_tile[0] < x_grid_size and 0 <= start_tile[1] < y_grid_size):
+            raise ValueError(f"board {board} of the archive is damaged, its start tile is outside the board")
+
+        mines_bitmap    = self.data[record_offset + archive_record.size:record_offset + record_size]
+
+        mines_locations = [
+            (bit % x_grid_size, bit // x_grid_size) for bit in range(x_grid_size * y_grid_size)
+            if mines_bitmap[bit // 8] & (1 << (bit % 8))
+        ]
+
+        return mines_locations, calculate_hint_numbers(mines_locations, x_grid_size, y_grid_size), start_tile
+
+    def close(self):
+        self.data.close()
+
+
+def minesweeper(x_grid_size: int = 15, y_grid_size: int = 15, const_amount_of_mines: int = 20,
+                board_archive: BoardArchive = None, board: int = 0):
     font_init()                 # -> pygame.font.init()
     set_caption("Minesweeper")  # -> pygame.display.set_caption()
 
@@ -140,16 +505,33 @@ def minesweeper():
     clock, elapsed_time   = Clock(), 0           # -> pygame.time.Clock()
     time, time_record     = 0, None
 
+    # Time records are kept separately for every board size and amount of mines
+    time_records          = {}
+    board_size            = (x_grid_size, y_grid_size, const_amount_of_mines)
+
+    # Archive boards start with a flipped tile and no-guess boards never need guessing, so their records are
+    # kept apart from the records of random boards
+    board_section         = None
+    if board_archive is not None:
+        board_section = board_archive.find_section(x_grid_size, y_grid_size, const_amount_of_mines)
+        board_size   += ("no-guess archive" if board_archive.is_no_guess(board_section) else "archive",)
+
     # Check if a savefile can be found and if so, load the saved time record as the time record
     try:
         if Path("minesweeper.save").exists():   # -> pathlib.Path()
             with open("minesweeper.save", "rb") as savefile:
-                time_record = load(savefile)
+                time_records = load(savefile)
                 savefile.close()
+
+            # Older savefiles only have the record of the default 15x15 board with 20 mines
+            if not isinstance(time_records, dict):
+                time_records = {(15, 15, 20): time_records}
+
+            time_record = time_records.get(board_size)
     except Exception:
         # There has been an error loading the file, if the code in this block is executed.
         # Possibly due to the user trying to modify the save file, as it cannot be modified or it will be corrupted
-        pass
+        time_records = {}
 
     process_interrupted   = False
     game_started          = False
@@ -162,7 +544,6 @@ def minesweeper():
     display_previous_size    = display_size
 
     gameboard_size           = gameboard.get_size()
-    x_grid_size, y_grid_size = 15, 15
     x_box_size               = gameboard_size[0] / x_grid_size
     y_box_size               = gameboard_size[1] / y_grid_size
 
@@ -178,8 +559,6 @@ def minesweeper():
 
     hover.fill((0, 0, 0, 40))
 
-    const_amount_of_mines             = 20  # This value should not be modified
-
     amount_of_mines = amount_of_flags = const_amount_of_mines
     mines_locations, hint_numbers     = None, None
 
@@ -187,6 +566,12 @@ def minesweeper():
     flipped_tiles                     = []
     incorrect_tiles                   = []
 
+    # Boards from an archive are loaded right away and their start tile is flipped for the player, because
+    # the mines are already placed and the first click cannot be used to avoid them
+    if board_archive is not None:
+        mines_locations, hint_numbers, start_tile = board_archive.load_board(board_section, board)
+        flip_tiles(start_tile, flipped_tiles, flagged_tiles, mines_locations, hint_numbers, x_grid_size, y_grid_size)
+
     # -----------------------------------------------------
 
     initializing_game    = True
@@ -221,10 +606,10 @@ def minesweeper():
 
             display_size = display_previous_size = display.get_size()
 
-            if display.get_size()[0] >= display.get_size()[1]:
-                gameboard_size = (int(display_size[1] * 0.7), int(display_size[1] * 0.7))
-            else:
-                gameboard_size = (int(display_size[0] * 0.7), int(display_size[0] * 0.7))
+            # Keep the tiles square, so boards that are not square get a gameboard with the same shape.
+            # The gameboard is as big as fits in 70% of the display in both directions
+            tile_size      = min(display_size[0] * 0.7 / x_grid_size, display_size[1] * 0.7 / y_grid_size)
+            gameboard_size = (int(tile_size * x_grid_size), int(tile_size * y_grid_size))
 
             gameboard  = scale(gameboard, gameboard_size)
 
@@ -562,40 +947,10 @@ def minesweeper():
 
                             if click_location not in mines_locations and click_location not in flipped_tiles:
                                 # Flip all the flippable tiles connected to the clicked tile
-                                current_tile = (click_location[0], click_location[1])
-                                path         = [current_tile]
-
-                                flipped_tiles.append((current_tile[0], current_tile[1]))
-
-                                # Using reverse backtracking to flip all the tiles connected to the clicked tile
-                                while len(path) > 0:
-                                    available_neighbours = []
-                                    tiles_to_check       = [
-                                        (current_tile[0], current_tile[1]-1),     # Top
-                                        (current_tile[0]+1, current_tile[1]-1),   # Top right
-                                        (current_tile[0]+1, current_tile[1]),     # Right
-                                        (current_tile[0]+1, current_tile[1]+1),   # Bottom right
-                                        (current_tile[0], current_tile[1]+1),     # Bottom
-                                        (current_tile[0]-1, current_tile[1]+1),   # Bottom left
-                                        (current_tile[0]-1, current_tile[1]),     # Left
-                                        (current_tile[0]-1, current_tile[1]-1)    # Top left
-                                    ]
-
-                                    for tile in tiles_to_check:
-                                        if 0 < tile[0]+1 < x_grid_size+1 and 0 < tile[1]+1 < y_grid_size+1:
-                                            if hint_numbers[current_tile[1]][current_tile[0]] == 0:
-                                                if tile not in flipped_tiles:
-                                                    if tile not in flagged_tiles:
-                                                        if tile not in mines_locations:
-                                                            available_neighbours.append(tile)
-
-                                    if len(available_neighbours) > 0:
-                                        path.append(current_tile)
-                                        current_tile = list(available_neighbours)[0]
-                                        flipped_tiles.append(current_tile)
-                                    else:
-                                        current_tile = path[-1]
-                                        path         = path[:-1]
+                                flip_tiles(
+                                    click_location, flipped_tiles, flagged_tiles, mines_locations, hint_numbers,
+                                    x_grid_size, y_grid_size
+                                )
 
                             else:
                                 game_over             = True
@@ -621,8 +976,9 @@ def minesweeper():
                                 flagged_tiles.pop(flagged_tiles.index(click_location))
                                 amount_of_flags += 1
 
-                # Check if all the mines are flagged and if so, the game is over
-                if amount_of_flags == 0:
+                # Check if all the mines are flagged and if so, the game is over. The mines of a random board
+                # are not placed before the first click, so there is nothing to check before that
+                if amount_of_flags == 0 and mines_locations is not None:
                     all_mines_flagged = True
                     for flagged_mine in mines_locations:
                         if flagged_mine not in flagged_tiles:
@@ -638,9 +994,9 @@ def minesweeper():
 
                             # Save the new record in to a file
                             if time_record is None or time < float(time_record):
-                                time_record = f"{time:.1f}"
+                                time_record = time_records[board_size] = f"{time:.1f}"
                                 with open("minesweeper.save", "wb") as savefile:
-                                    dump(time_record, savefile)
+                                    dump(time_records, savefile)
                                     savefile.close()
 
             if event.type == KEYDOWN:   # -> pygame.KEYDOWN
@@ -661,6 +1017,16 @@ def minesweeper():
                         # why this doesn't work, as it should do the same thing as the line below?
                         flagged_tiles, flipped_tiles, incorrect_tiles = [], [], []
 
+                        # Continue with the next board of the archive
+                        if board_archive is not None:
+                            board = (board + 1) % board_archive.amount_of_boards(board_section)
+
+                            mines_locations, hint_numbers, start_tile = board_archive.load_board(board_section, board)
+                            flip_tiles(
+                                start_tile, flipped_tiles, flagged_tiles, mines_locations, hint_numbers,
+                                x_grid_size, y_grid_size
+                            )
+
                         if game_over_screen_visible:
                             game_over_screen_out = True
 
@@ -671,4 +1037,94 @@ def minesweeper():
 
 
 if __name__ == "__main__":
-    minesweeper()
+    parser = ArgumentParser(description="Minesweeper game made in Python")
+    parser.add_argument(
+        "--size", type=parse_board_size,
+        help="board size as WIDTHxHEIGHT:MINES (default 15x15:20, or the first size in the archive)"
+    )
+    parser.add_argument("--archive", help="play the boards of a board archive instead of random boards")
+    parser.add_argument(
+        "--board", type=parse_amount, help="number of the first board to play from the archive (default 0)"
+    )
+    parser.add_argument(
+        "--no-guess", action="store_true", dest="play_no_guess", help="only play no-guess boards from the archive"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    generate_parser = subparsers.add_parser("generate", help="generate a board archive")
+    generate_parser.add_argument("path", help="file to write the board archive to")
+    generate_parser.add_argument(
+        "--size", type=parse_board_size, action="append", dest="sizes",
+        help="board size as WIDTHxHEIGHT:MINES, can be given multiple times (default 15x15:20)"
+    )
+    generate_parser.add_argument("--count", type=parse_amount, default=1000, help="amount of boards for each size")
+    generate_parser.add_argument("--no-guess", action="store_true", help="only keep boards solvable without guessing")
+    generate_parser.add_argument(
+        "--max-tries", type=parse_amount, default=10000, help="boards to try for each no-guess board before giving up"
+    )
+    generate_parser.add_argument("--seed", type=int, help="seed for the random generator to get the same boards")
+
+    arguments = parser.parse_args()
+
+    if arguments.command == "generate":
+        # The options before the command are only for playing, the sizes of the archive are given after it
+        if arguments.archive is not None or arguments.board is not None:
+            parser.error("--archive and --board cannot be used with generate")
+        if arguments.play_no_guess:
+            parser.error("give --no-guess after generate to generate no-guess boards")
+        if arguments.size is not None:
+            parser.error("give the board sizes of the archive with --size after generate")
+
+        if arguments.seed is not None:
+            seed(arguments.seed)    # -> random.seed()
+
+        try:
+            generate_board_archive(
+                arguments.path, arguments.sizes or [(15, 15, 20)], arguments.count, arguments.no_guess,
+                arguments.max_tries, progress_interval=10000
+            )
+        except ValueError as error:
+            parser.error(str(error))
+    elif arguments.archive is None:
+        if arguments.board is not None or arguments.play_no_guess:
+            parser.error("--board and --no-guess can only be used with --archive")
+
+        minesweeper(*(arguments.size or (15, 15, 20)))
+    else:
+        # Check the archive before opening the game window, so a wrong size or board is reported right away
+        try:
+            archive = BoardArchive(arguments.archive)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+
+        # Without --size the first size in the archive is played, or the first no-guess size with --no-guess
+        no_guess   = True if arguments.play_no_guess else None
+        board_size = arguments.size or next(
+            (section[:3] for section in archive.sections if no_guess is None or section[3]), None
+        )
+
+        if board_size is None:
+            parser.error(f"'{arguments.archive}' has no {'no-guess ' if no_guess else ''}boards")
+
+        try:
+            board_section = archive.find_section(*board_size, no_guess)
+        except KeyError as error:
+            parser.error(error.args[0])
+
+        board = arguments.board or 0
+        if not 0 <= board < archive.amount_of_boards(board_section):
+            parser.error(
+                f"--board {board} is out of range, the archive has {archive.amount_of_boards(board_section)} "
+                f"boards of this size"
+            )
+
+        try:
+            archive.load_board(board_section, board)
+        except ValueError as error:
+            parser.error(str(error))
+
+        try:
+            minesweeper(*archive.sections[board_section][:3], archive, board)
+        finally:
+            archive.close()